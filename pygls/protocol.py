@@ -68,6 +68,11 @@ from lsprotocol.types import (
 from pygls.uris import from_fs_path
 from pygls.workspace import Workspace
 
+try:
+    import orjson
+except ImportError:
+    orjson = None  # type: ignore
+
 logger = logging.getLogger(__name__)
 
 F = TypeVar("F", bound=Callable)
@@ -129,6 +134,24 @@ class JsonRPCResponseMessage:
     result: Any
 
 
+@lru_cache(maxsize=256)
+def _namedtuple_type(type_name: str, fields: tuple):
+    """Returns a namedtuple type, reusing it for objects with the same fields."""
+    return namedtuple(type_name, fields, rename=True)
+
+
+def _to_namedtuple(value: Any, type_name: str):
+    """Convert dicts nested anywhere in value to namedtuples."""
+    if isinstance(value, dict):
+        object_type = _namedtuple_type(type_name, tuple(value.keys()))
+        return object_type(*(_to_namedtuple(v, type_name) for v in value.values()))
+
+    if isinstance(value, list):
+        return [_to_namedtuple(v, type_name) for v in value]
+
+    return value
+
+
 def _dict_to_object(d: Any):
     """Create nested objects (namedtuple) from dict."""
 
@@ -139,10 +162,27 @@ def _dict_to_object(d: Any):
         return d
 
     type_name = d.pop('type_name', 'Object')
-    return json.loads(
-        json.dumps(d),
-        object_hook=lambda p: namedtuple(type_name, p.keys(), rename=True)(*p.values())
-    )
+    return _to_namedtuple(d, type_name)
+
+
+def _json_dumps(data, default) -> bytes:
+    """Serializes data as UTF-8 encoded JSON, using `orjson` if it is installed."""
+    if orjson is not None:
+        try:
+            return orjson.dumps(data, default=default, option=orjson.OPT_NON_STR_KEYS)
+        except TypeError:
+            # e.g. integers that don't fit in 64 bits, which `json` can encode
+            pass
+
+    return json.dumps(data, default=default).encode('utf-8')
+
+
+def _json_loads(data: Union[bytes, str]) -> Any:
+    """Parses JSON data, using `orjson` if it is installed."""
+    if orjson is not None:
+        return orjson.loads(data)
+
+    return json.loads(data)
 
 
 def _params_field_structure_hook(obj, cls):
@@ -211,7 +251,7 @@ class JsonRPCProtocol(asyncio.Protocol):
 
         self.fm = FeatureManager(server)
         self.transport = None
-        self._message_buf = []
+        self._message_buf = bytearray()
 
         self._send_only_body = False
 
@@ -225,7 +265,8 @@ class JsonRPCProtocol(asyncio.Protocol):
             future.add_done_callback(self._execute_notification_callback)
         else:
             if is_thread_function(handler):
-                self._server.thread_pool.apply_async(handler, (*params, ))
+                future = self._server.thread_pool_executor.submit(handler, *params)
+                future.add_done_callback(self._execute_notification_callback)
             else:
                 handler(*params)
 
@@ -251,14 +292,11 @@ class JsonRPCProtocol(asyncio.Protocol):
             self._request_futures[msg_id] = future
             future.add_done_callback(partial(self._execute_request_callback, msg_id))
         else:
-            # Can't be canceled
             if is_thread_function(handler):
-                self._server.thread_pool.apply_async(
-                    handler, (params, ),
-                    callback=partial(
-                        self._send_response, msg_id,
-                    ),
-                    error_callback=partial(self._execute_request_err_callback, msg_id))
+                # Can only be canceled before it starts executing
+                future = self._server.thread_pool_executor.submit(handler, params)
+                self._request_futures[msg_id] = future
+                future.add_done_callback(partial(self._execute_request_callback, msg_id))
             else:
                 self._send_response(msg_id, handler(params))
 
@@ -278,13 +316,6 @@ class JsonRPCProtocol(asyncio.Protocol):
             logger.exception('Exception occurred for message "%s": %s', msg_id, error)
             self._send_response(msg_id, error=error)
 
-    def _execute_request_err_callback(self, msg_id, exc):
-        """Error callback used for coroutine request message."""
-        exc_info = (type(exc), exc, None)
-        error = JsonRpcInternalError.of(exc_info).to_dict()
-        logger.exception('Exception occurred for message "%s": %s', msg_id, error)
-        self._send_response(msg_id, error=error)
-
     def _get_handler(self, feature_name):
         """Returns builtin or used defined feature by name if exists."""
         try:
@@ -384,10 +415,19 @@ class JsonRPCProtocol(asyncio.Protocol):
         if isinstance(data, enum.Enum):
             return data.value
 
+        # e.g. namedtuples created by `_dict_to_object`, which `json` encodes as
+        # arrays but `orjson` doesn't handle by itself
+        if isinstance(data, tuple):
+            return list(data)
+
         return data.__dict__
 
     def _deserialize_message(self, data):
-        """Function used to deserialize data recevied from the client."""
+        """Function used to deserialize data recevied from the client.
+
+        Only the top level object of a message is structured, so this can be
+        applied to the result of `json.loads` or used as its `object_hook`.
+        """
 
         if 'jsonrpc' not in data:
             return data
@@ -456,10 +496,10 @@ class JsonRPCProtocol(asyncio.Protocol):
             return
 
         try:
-            body = json.dumps(data, default=self._serialize_message)
-            logger.info('Sending data: %s', body)
+            body = _json_dumps(data, default=self._serialize_message)
+            if logger.isEnabledFor(logging.INFO):
+                logger.info('Sending data: %s', body.decode(self.CHARSET))
 
-            body = body.encode(self.CHARSET)
             if not self._send_only_body:
                 header = (
                     f'Content-Length: {len(body)}\r\n'
@@ -473,6 +513,16 @@ class JsonRPCProtocol(asyncio.Protocol):
             logger.exception("Error sending data", exc_info=True)
             self._server._report_server_error(error, JsonRpcInternalError)
 
+    def _send_data_error(self, error):
+        """Handles an error from sending data, which was raised after `_send_data`
+        returned (e.g. by a transport that buffers data).
+        """
+        if isinstance(error, BrokenPipeError):
+            self.connection_lost(error)
+
+        logger.error("Error sending data", exc_info=error)
+        self._server._report_server_error(error, JsonRpcInternalError)
+
     def _send_response(self, msg_id, result=None, error=None):
         """Sends a JSON RPC response to the client.
 
@@ -511,35 +561,69 @@ class JsonRPCProtocol(asyncio.Protocol):
             logger.exception("Error receiving data", exc_info=True)
             self._server._report_server_error(error, JsonRpcInternalError)
 
+    def _message_received(self, message):
+        """Handles a message which has already been parsed by `_parse_body`."""
+        if message is None:
+            return
+
+        try:
+            self._procedure_handler(message)
+        except Exception as error:
+            logger.exception("Error receiving data", exc_info=True)
+            self._server._report_server_error(error, JsonRpcInternalError)
+
+    def _parse_body(self, body: Union[bytes, str, dict]):
+        """Parses the body of a message received from the client.
+
+        The body may also be a ``dict`` that was already decoded from JSON,
+        in which case only the message structure is converted.
+
+        Safe to call outside of the event loop thread, so that messages can be
+        parsed by the thread reading them. Returns ``None`` if parsing failed.
+        """
+        logger.debug('Received %r', body)
+
+        try:
+            if not isinstance(body, dict):
+                body = _json_loads(body)
+            return self._deserialize_message(body)
+        except Exception as error:
+            logger.exception("Error receiving data", exc_info=True)
+            self._server._report_server_error(error, JsonRpcInternalError)
+            return None
+
     def _data_received(self, data: bytes):
         """Method from base class, called when server receives the data"""
         logger.debug('Received %r', data)
 
-        while len(data):
-            # Append the incoming chunk to the message buffer
-            self._message_buf.append(data)
+        # Append the incoming chunk to the message buffer
+        buf = self._message_buf
+        buf += data
 
+        # Look the compiled pattern's method up once, not once per message
+        fullmatch = self.MESSAGE_PATTERN.fullmatch
+
+        while buf:
             # Look for the body of the message
-            message = b''.join(self._message_buf)
-            found = JsonRPCProtocol.MESSAGE_PATTERN.fullmatch(message)
+            found = fullmatch(buf)
+            if not found:
+                return
 
-            body = found.group('body') if found else b''
-            length = int(found.group('length')) if found else 1
+            body_start = found.start('body')
+            body_end = body_start + int(found.group('length'))
 
-            if len(body) < length:
+            if len(buf) < body_end:
                 # Message is incomplete; bail until more data arrives
                 return
 
             # Message is complete;
-            # extract the body and any remaining data,
-            # and reset the buffer for the next message
-            body, data = body[:length], body[length:]
-            self._message_buf = []
+            # extract the body and remove the message from the buffer,
+            # keeping any remaining data for the next message
+            body = bytes(memoryview(buf)[body_start:body_end])
+            del buf[:body_end]
 
             # Parse the body
-            self._procedure_handler(
-                json.loads(body.decode(self.CHARSET),
-                           object_hook=self._deserialize_message))
+            self._procedure_handler(self._deserialize_message(_json_loads(body)))
 
     def get_message_type(self, method: str) -> Optional[Type]:
         """Return the type definition of the message associated with the given method."""
@@ -749,7 +833,9 @@ class LanguageServerProtocol(JsonRPCProtocol, metaclass=LSPMeta):
     @lsp_method(SHUTDOWN)
     def lsp_shutdown(self, *args) -> None:
         """Request from client which asks server to shutdown."""
-        for future in self._request_futures.values():
+        # Cancelled futures (and finished ones, from worker threads) remove
+        # themselves from the dict
+        for future in list(self._request_futures.values()):
             future.cancel()
 
         self._shutdown = True
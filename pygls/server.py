@@ -15,12 +15,14 @@
 # limitations under the License.                                           #
 ############################################################################
 import asyncio
-import json
+import io
 import logging
-import re
+import os
+import stat
 import sys
+from collections import deque
 from concurrent.futures import Future, ThreadPoolExecutor
-from threading import Event
+from threading import Barrier, Event, Lock, Thread
 from typing import Any, Callable, List, Optional, TextIO, TypeVar, Union
 
 from pygls import IS_WIN, IS_PYODIDE
@@ -37,86 +39,391 @@ from pygls.progress import Progress
 from pygls.protocol import LanguageServerProtocol, default_converter
 from pygls.workspace import Workspace
 
-if not IS_PYODIDE:
-    from multiprocessing.pool import ThreadPool
-
-
 logger = logging.getLogger(__name__)
 
 F = TypeVar('F', bound=Callable)
 
+READ_BUFFER_SIZE = 64 * 1024
+# Amount of data buffered from a pipe before its reading is paused
+PIPE_READ_LIMIT = 1024 * 1024
 
-async def aio_readline(loop, executor, stop_event, rfile, proxy):
-    """Reads data from stdin in separate thread (asynchronously)."""
 
-    CONTENT_LENGTH_PATTERN = re.compile(rb'^Content-Length: (\d+)\r\n$')
+def _get_max_workers(max_workers: Optional[int] = None) -> int:
+    """Returns the number of thread pool workers.
 
-    # Initialize message buffer
-    message = []
-    content_length = 0
+    If not given, it can be set with the ``PYGLS_MAX_WORKERS`` environment
+    variable, otherwise it's the same as the ``ThreadPoolExecutor`` default.
+    """
+    if max_workers is not None:
+        if max_workers <= 0:
+            raise ValueError('max_workers must be greater than 0')
+        return max_workers
 
-    while not stop_event.is_set() and not rfile.closed:
-        # Read a header line
-        header = await loop.run_in_executor(executor, rfile.readline)
-        if not header:
-            break
-        message.append(header)
+    value = os.environ.get('PYGLS_MAX_WORKERS')
+    if value is not None:
+        try:
+            max_workers = int(value)
+        except ValueError:
+            max_workers = 0
+
+        if max_workers > 0:
+            return max_workers
+
+        logger.warning('Ignoring invalid PYGLS_MAX_WORKERS value "%s"', value)
 
-        # Extract content length if possible
-        if not content_length:
-            match = CONTENT_LENGTH_PATTERN.fullmatch(header)
-            if match:
-                content_length = int(match.group(1))
-                logger.debug('Content length: %s', content_length)
+    return min(32, (os.cpu_count() or 1) + 4)
 
-        # Check if all headers have been read (as indicated by an empty line \r\n)
-        if content_length and not header.strip():
 
-            # Read body
-            body = await loop.run_in_executor(executor, rfile.read, content_length)
-            if not body:
+def _content_length(headers: bytes) -> int:
+    """Returns the value of the ``Content-Length`` header, or ``0`` if missing
+    or invalid.
+
+    The header is searched for anywhere, so that it's still found if the body
+    of a previous, skipped message is left in front of it.
+    """
+    # Clients usually send it as the first (or only) header
+    start = headers.find(b'Content-Length:')
+    if start == -1:
+        return 0
+
+    end = headers.find(b'\r\n', start)
+    try:
+        content_length = int(headers[start + 15:end] if end != -1 else headers[start + 15:])
+    except ValueError:
+        return 0
+
+    return max(content_length, 0)
+
+
+def _is_pipe(rfile) -> bool:
+    """Checks if ``rfile`` can be read directly by the event loop."""
+    if IS_WIN:
+        # ProactorEventLoop can only read from overlapped pipes
+        return False
+
+    try:
+        mode = os.fstat(rfile.fileno()).st_mode
+    except (AttributeError, OSError, ValueError):
+        return False
+
+    # Sockets are left out, since reading from the event loop makes the whole
+    # file description non-blocking and a client may use the same socket for
+    # both stdin and stdout, which then can't be written to reliably
+    return stat.S_ISFIFO(mode)
+
+
+async def _aio_read_pipe(loop, stop_event, rfile, proxy, parse):
+    """Reads LSP messages from a pipe on the event loop, without any threads."""
+    # With the default limit (64 KiB), reading is paused and resumed again for
+    # every chunk of large messages, each time costing extra system calls.
+    reader = asyncio.StreamReader(limit=PIPE_READ_LIMIT)
+    transport, _ = await loop.connect_read_pipe(
+        lambda: asyncio.StreamReaderProtocol(reader), rfile
+    )
+
+    # Avoid attribute lookups for every message
+    is_stopped = stop_event.is_set
+    readuntil = reader.readuntil
+    readexactly = reader.readexactly
+
+    try:
+        while not is_stopped():
+            # Read all headers (terminated by an empty line \r\n) and the body
+            try:
+                headers = await readuntil(b'\r\n\r\n')
+                content_length = _content_length(headers)
+                if not content_length:
+                    logger.warning('Skipping message without Content-Length header')
+                    continue
+
+                body = await readexactly(content_length)
+            except asyncio.IncompleteReadError:
                 break
-            message.append(body)
 
             # Pass message to language server protocol
-            proxy(b''.join(message))
+            proxy(parse(body) if parse else headers + body)
+    finally:
+        transport.close()
+
+
+def _has_buffered_data(rfile, fd: int) -> bool:
+    """Checks if ``rfile`` holds data already read from its file descriptor.
+
+    Can only be told for seekable files, other inputs (e.g. pipes) must not be
+    read from before they are passed to the server.
+    """
+    try:
+        return rfile.seekable() and rfile.tell() != os.lseek(fd, 0, os.SEEK_CUR)
+    except (AttributeError, OSError, ValueError):
+        return False
 
-            # Reset the buffer
-            message = []
-            content_length = 0
+
+def _readinto(rfile) -> Callable[[memoryview], int]:
+    """Returns a function which reads available data from ``rfile`` into a buffer."""
+    try:
+        fd = rfile.fileno()
+    except (AttributeError, OSError, ValueError):
+        # Not backed by a file descriptor (e.g. ``io.BytesIO``)
+        fd = None
+
+    # On Windows, descriptors of sockets can't be read as files
+    if fd is not None and not IS_WIN and not _has_buffered_data(rfile, fd):
+        # Read straight from the file descriptor. Unlike a buffered reader, this
+        # doesn't take a lock, so closing ``rfile`` from the event loop (e.g. on
+        # ``exit``) can't deadlock while this thread is blocked on read.
+        return io.FileIO(fd, 'rb', closefd=False).readinto
+
+    # Unlike ``readinto``, ``readinto1`` doesn't wait for the whole buffer
+    # to be filled
+    for name in ('readinto1', 'readinto'):
+        if hasattr(rfile, name):
+            return getattr(rfile, name)
+
+    read = getattr(rfile, 'read1', rfile.read)
+
+    def readinto(buf):
+        data = read(len(buf))
+        buf[:len(data)] = data
+        return len(data)
+
+    return readinto
+
+
+def _read_messages(loop, stop_event, rfile, proxy, parse):
+    """Reads LSP messages from ``rfile`` and passes them to the event loop.
+
+    Runs in a dedicated thread, so every message costs a single hand-off to the
+    event loop instead of an executor round-trip per header line.
+
+    Data is read in bulk into a single buffer, which holds as many messages as
+    are available and each message is copied out of it exactly once.
+    """
+
+    # Avoid attribute lookups for every message
+    is_stopped = stop_event.is_set
+    readinto = _readinto(rfile)
+    call_soon_threadsafe = loop.call_soon_threadsafe
+
+    # Messages are handed over in batches, waking up the event loop only if it
+    # has already processed all messages handed over to it before. The flag is
+    # cleared before draining, so a message is never left behind.
+    pending = deque()
+    drain_scheduled = False
+
+    def drain():
+        nonlocal drain_scheduled
+        drain_scheduled = False
+
+        # Don't keep the event loop busy with messages that arrive meanwhile
+        for _ in range(len(pending)):
+            proxy(pending.popleft())
+
+    buf = bytearray(READ_BUFFER_SIZE)
+    # Data that is yet to be processed is kept in ``buf[start:end]``
+    start = end = 0
+    # End of the current message, known once all of its headers have been read
+    message_end = 0
+
+    while not is_stopped():
+        if not message_end:
+            # Check if all headers have been read (as indicated by an empty line \r\n)
+            header_end = buf.find(b'\r\n\r\n', start, end)
+            if header_end != -1:
+                content_length = _content_length(buf[start:header_end])
+                if content_length:
+                    message_end = header_end + 4 + content_length
+                else:
+                    logger.warning('Skipping message without Content-Length header')
+                    start = header_end + 4
+                    continue
+
+        if message_end and message_end <= end:
+            # Pass message to language server protocol
+            if parse:
+                body_start = message_end - content_length
+                message = parse(bytes(memoryview(buf)[body_start:message_end]))
+            else:
+                message = bytes(memoryview(buf)[start:message_end])
+            pending.append(message)
+            if not drain_scheduled:
+                drain_scheduled = True
+                call_soon_threadsafe(drain)
+
+            start, message_end = message_end, 0
+            continue
+
+        # Message is incomplete, move it to the front of the buffer and make
+        # sure there is enough room to read the rest of it
+        if start:
+            buf[:end - start] = buf[start:end]
+            end -= start
+            if message_end:
+                message_end -= start
+            start = 0
+
+        size = max(message_end, end + 1)
+        if size > len(buf):
+            buf.extend(bytes(max(size, 2 * len(buf)) - len(buf)))
+
+        count = readinto(memoryview(buf)[end:])
+        if not count:
+            break
+        end += count
+
+
+async def _aio_read_thread(loop, stop_event, rfile, proxy, parse):
+    """Reads LSP messages from ``rfile`` in a separate thread."""
+    future = loop.create_future()
+
+    def set_done():
+        if not future.done():
+            future.set_result(None)
+
+    def reader():
+        try:
+            _read_messages(loop, stop_event, rfile, proxy, parse)
+        except (OSError, RuntimeError):
+            # Input was closed or the event loop has already been closed
+            logger.debug('Stopped reading from %s', rfile, exc_info=True)
+        except ValueError:
+            # Reading from a closed file object raises ValueError as well
+            if getattr(rfile, 'closed', False):
+                logger.debug('Stopped reading from %s', rfile, exc_info=True)
+            else:
+                logger.exception('Failed to read from %s', rfile)
+        finally:
+            try:
+                loop.call_soon_threadsafe(set_done)
+            except RuntimeError:
+                # Event loop has already been closed
+                pass
+
+    Thread(target=reader, name='pygls reader', daemon=True).start()
+    await future
+
+
+async def aio_readline(loop, stop_event, rfile, proxy, parse=None):
+    """Reads data from stdin asynchronously.
+
+    Pipes are read by the event loop itself, anything else (e.g. regular files,
+    or any input on Windows) is read in a separate thread.
+
+    ``proxy`` is called on the event loop with each message. If ``parse`` is
+    given, ``proxy`` receives the result of ``parse(body)`` instead of the raw
+    message, and when reading in a separate thread ``parse`` runs in that thread.
+
+    Reading stops once ``stop_event`` is set, which is checked before each
+    message. It's a ``threading.Event``, so that it can be set from any thread;
+    checking it only reads a flag, without taking a lock.
+    """
+    if _is_pipe(rfile):
+        await _aio_read_pipe(loop, stop_event, rfile, proxy, parse)
+    else:
+        await _aio_read_thread(loop, stop_event, rfile, proxy, parse)
+
+
+def _running_loop():
+    try:
+        return asyncio.get_running_loop()
+    except RuntimeError:
+        return None
 
 
 class StdOutTransportAdapter:
     """Protocol adapter which overrides write method.
 
-    Write method sends data to stdout.
+    Write method sends data to stdout. If an event loop is given, data
+    written from that loop is buffered and flushed once at the end of the
+    current loop iteration, so consecutive messages share a single write.
+    Writes from other threads are sent right away, after any buffered data.
+
+    Errors from flushing buffered data are passed to ``on_error``, since there
+    is no caller to raise them to. Buffered data that failed to be written is
+    dropped.
     """
 
-    def __init__(self, rfile, wfile):
+    def __init__(self, rfile, wfile, loop=None, on_error=None):
         self.rfile = rfile
         self.wfile = wfile
+        self._loop = loop
+        self._on_error = on_error
+        self._lock = Lock()
+        self._pending = bytearray()
+        self._flush_failed = False
 
     def close(self):
-        self.rfile.close()
-        self.wfile.close()
+        try:
+            self._flush()
+        finally:
+            self.rfile.close()
+            self.wfile.close()
+
+    def _flush(self):
+        with self._lock:
+            if self._pending:
+                try:
+                    self.wfile.write(self._pending)
+                    self.wfile.flush()
+                finally:
+                    self._pending.clear()
+
+    def _flush_buffered(self):
+        """Flushes data buffered during the last event loop iteration."""
+        try:
+            self._flush()
+        except Exception as error:
+            # Reporting an error may write to stdout again, so if that fails
+            # as well, it's only left to the event loop to log it
+            if self._on_error is None or self._flush_failed:
+                raise
+
+            self._flush_failed = True
+            self._on_error(error)
+        else:
+            self._flush_failed = False
 
     def write(self, data):
-        self.wfile.write(data)
-        self.wfile.flush()
+        if self._loop is not None and _running_loop() is self._loop:
+            with self._lock:
+                if not self._pending:
+                    self._loop.call_soon(self._flush_buffered)
+                self._pending += data
+            return
+
+        with self._lock:
+            if self._pending:
+                self._pending += data
+                data = self._pending
+            try:
+                self.wfile.write(data)
+                self.wfile.flush()
+            finally:
+                self._pending.clear()
 
 
 class PyodideTransportAdapter:
     """Protocol adapter which overrides write method.
 
-    Write method sends data to stdout.
+    Write method sends data to stdout. Messages from the client are already
+    framed by the web platform and are passed to the `recv` method.
     """
 
-    def __init__(self, wfile):
+    def __init__(self, wfile, protocol=None):
         self.wfile = wfile
+        self.protocol = protocol
 
     def close(self):
         self.wfile.close()
 
+    def recv(self, payload):
+        """Handles a message sent by the client.
+
+        ``payload`` is the JSON encoded message, or the message already
+        converted to a ``dict`` (e.g. with ``JsProxy.to_py()``), in which case
+        it isn't decoded again.
+        """
+        self.protocol._message_received(self.protocol._parse_body(payload))
+
     def write(self, data):
         self.wfile.write(data)
         self.wfile.flush()
@@ -125,20 +432,39 @@ class PyodideTransportAdapter:
 class WebSocketTransportAdapter:
     """Protocol adapter which calls write method.
 
-    Write method sends data via the WebSocket interface.
+    Write method sends data via the WebSocket interface. Messages are queued
+    and sent in order by a single task, which runs for as long as the
+    connection is open.
     """
 
     def __init__(self, ws, loop):
         self._ws = ws
         self._loop = loop
+        self._queue = asyncio.Queue()
+        self._sender = loop.create_task(self._send_messages())
+
+    async def _send_messages(self):
+        """Send queued messages into the WebSocket."""
+        while True:
+            data = await self._queue.get()
+            await self._ws.send(data)
 
     def close(self) -> None:
         """Stop the WebSocket server."""
+        self._sender.cancel()
         self._ws.close()
 
     def write(self, data: Any) -> None:
-        """Create a task to write specified data into a WebSocket."""
-        asyncio.ensure_future(self._ws.send(data))
+        """Queue specified data to be written into a WebSocket.
+
+        The queue is unbounded, since ``write`` can be called from any thread
+        and can't wait for room in the queue. Data written from the event loop
+        is queued right away, other threads hand it over to the loop.
+        """
+        if _running_loop() is self._loop:
+            self._queue.put_nowait(data)
+        else:
+            self._loop.call_soon_threadsafe(self._queue.put_nowait, data)
 
 
 class Server:
@@ -150,10 +476,14 @@ class Server:
 
         converter_factory: Factory function to use when constructing a cattrs converter.
 
-        loop(AbstractEventLoop): asyncio event loop
+        loop(AbstractEventLoop, optional): asyncio event loop used by the
+                                           `start_*` methods, created on first use
+                                           if not given. The `serve_*` coroutines
+                                           run on the current event loop instead
 
-        max_workers(int, optional): Number of workers for `ThreadPool` and
-                                    `ThreadPoolExecutor`
+        max_workers(int, optional): Number of workers for `ThreadPoolExecutor`,
+                                    defaults to ``PYGLS_MAX_WORKERS`` environment
+                                    variable or ``min(32, os.cpu_count() + 4)``
 
         sync_kind(TextDocumentSyncKind): Text document synchronization option
             - None(0): no synchronization
@@ -164,49 +494,54 @@ class Server:
         _max_workers(int): Number of workers for thread pool executor
         _server(Server): Server object which can be used to stop the process
         _stop_event(Event): Event used for stopping `aio_readline`
-        _thread_pool(ThreadPool): Thread pool for executing methods decorated
-                                  with `@ls.thread()` - lazy instantiated
-        _thread_pool_executor(ThreadPoolExecutor): Thread pool executor
-                                                   passed to `run_in_executor`
+        _thread_pool_executor(ThreadPoolExecutor): Thread pool executor used
+                                                   for executing methods decorated
+                                                   with `@ls.thread()`
                                                     - lazy instantiated
     """
 
-    def __init__(self, protocol_cls, converter_factory, loop=None, max_workers=2,
+    def __init__(self, protocol_cls, converter_factory, loop=None, max_workers=None,
                  sync_kind=TextDocumentSyncKind.Incremental):
         if not issubclass(protocol_cls, asyncio.Protocol):
             raise TypeError('Protocol class should be subclass of asyncio.Protocol')
 
-        self._max_workers = max_workers
+        self._loop = loop
+        self._max_workers = _get_max_workers(max_workers)
         self._server = None
         self._stop_event = None
-        self._thread_pool = None
         self._thread_pool_executor = None
         self.sync_kind = sync_kind
 
-        if IS_WIN:
-            asyncio.set_event_loop(asyncio.ProactorEventLoop())
-        elif not IS_PYODIDE:
-            asyncio.set_event_loop(asyncio.SelectorEventLoop())
-
-        self.loop = loop or asyncio.new_event_loop()
+        self.lsp = protocol_cls(self, converter_factory())
 
-        try:
-            if not IS_PYODIDE:
-                asyncio.get_child_watcher().attach_loop(self.loop)
-        except NotImplementedError:
-            pass
+    @property
+    def loop(self) -> asyncio.AbstractEventLoop:
+        """Event loop the server runs on.
 
-        self.lsp = protocol_cls(self, converter_factory())
+        Created with the current event loop policy on first use, so e.g.
+        ``uvloop`` can be used by installing its policy before starting
+        the server.
+        """
+        if self._loop is None:
+            self._loop = asyncio.new_event_loop()
+        return self._loop
+
+    def _use_running_loop(self):
+        """Binds the server to the running event loop."""
+        loop = asyncio.get_running_loop()
+        if self._loop is None:
+            self._loop = loop
+            if self._thread_pool_executor:
+                loop.set_default_executor(self._thread_pool_executor)
+        elif self._loop is not loop:
+            raise RuntimeError('Server is already bound to a different event loop')
 
     def shutdown(self):
         """Shutdown server."""
         logger.info('Shutting down the server')
 
-        self._stop_event.set()
-
-        if self._thread_pool:
-            self._thread_pool.terminate()
-            self._thread_pool.join()
+        if self._stop_event is not None:
+            self._stop_event.set()
 
         if self._thread_pool_executor:
             self._thread_pool_executor.shutdown()
@@ -218,22 +553,43 @@ class Server:
         logger.info('Closing the event loop.')
         self.loop.close()
 
-    def start_io(self, stdin: Optional[TextIO] = None, stdout: Optional[TextIO] = None):
-        """Starts IO server."""
+    def _connect_io(self, stdin: Optional[TextIO], stdout: Optional[TextIO]) -> None:
+        """Connects the protocol to stdout, so that it can send messages."""
         logger.info('Starting IO server')
 
         self._stop_event = Event()
         transport = StdOutTransportAdapter(stdin or sys.stdin.buffer,
-                                           stdout or sys.stdout.buffer)
+                                           stdout or sys.stdout.buffer,
+                                           self.loop,
+                                           self.lsp._send_data_error)
         self.lsp.connection_made(transport)
 
+    async def _read_io(self, stdin: Optional[TextIO]) -> None:
+        """Passes messages from stdin to the protocol, until the input is closed."""
+        await aio_readline(self.loop,
+                           self._stop_event,
+                           stdin or sys.stdin.buffer,
+                           self.lsp._message_received,
+                           self.lsp._parse_body)
+
+    async def serve_io(self, stdin: Optional[TextIO] = None,
+                       stdout: Optional[TextIO] = None):
+        """Serves the client over IO, until the input is closed.
+
+        Runs on the current event loop, e.g. ``asyncio.run(server.serve_io())``.
+        """
+        self._use_running_loop()
+        self._connect_io(stdin, stdout)
+        await self._read_io(stdin)
+
+    def start_io(self, stdin: Optional[TextIO] = None, stdout: Optional[TextIO] = None):
+        """Starts IO server."""
+        # Connect before the event loop is started, so that messages sent from
+        # other threads in the meantime aren't dropped
+        self._connect_io(stdin, stdout)
+
         try:
-            self.loop.run_until_complete(
-                aio_readline(self.loop,
-                             self.thread_pool_executor,
-                             self._stop_event,
-                             stdin or sys.stdin.buffer,
-                             self.lsp.data_received))
+            self.loop.run_until_complete(self._read_io(stdin))
         except BrokenPipeError:
             logger.error('Connection to the client is lost! Shutting down the server.')
         except (KeyboardInterrupt, SystemExit):
@@ -241,39 +597,57 @@ class Server:
         finally:
             self.shutdown()
 
-    def start_pyodide(self):
+    def start_pyodide(self) -> PyodideTransportAdapter:
+        """Starts the server in a Pyodide environment.
 
+        Returns the transport, whose `recv` method should be called with each
+        message received from the client.
+        """
         logger.info('Starting Pyodide server')
 
         # Note: We don't actually start anything running as the main event
         # loop will be handled by the web platform.
-        transport = PyodideTransportAdapter(sys.stdout)
+        transport = PyodideTransportAdapter(sys.stdout, self.lsp)
         self.lsp.connection_made(transport)
         self.lsp._send_only_body = True  # Don't send headers within the payload
 
-    def start_tcp(self, host: str, port: int) -> None:
-        """Starts TCP server."""
+        return transport
+
+    async def serve_tcp(self, host: str, port: int) -> None:
+        """Serves clients over TCP, until the server is closed.
+
+        Runs on the current event loop, e.g.
+        ``asyncio.run(server.serve_tcp(host, port))``.
+        """
+        self._use_running_loop()
         logger.info('Starting TCP server on %s:%s', host, port)
 
         self._stop_event = Event()
-        self._server = self.loop.run_until_complete(
-            self.loop.create_server(self.lsp, host, port)
-        )
+        self._server = await self.loop.create_server(self.lsp, host, port)
+        await self._server.wait_closed()
+
+    def start_tcp(self, host: str, port: int) -> None:
+        """Starts TCP server."""
         try:
-            self.loop.run_forever()
+            self.loop.run_until_complete(self.serve_tcp(host, port))
         except (KeyboardInterrupt, SystemExit):
             pass
         finally:
             self.shutdown()
 
-    def start_ws(self, host: str, port: int) -> None:
-        """Starts WebSocket server."""
+    async def serve_ws(self, host: str, port: int) -> None:
+        """Serves clients over WebSocket, until the server is closed.
+
+        Runs on the current event loop, e.g.
+        ``asyncio.run(server.serve_ws(host, port))``.
+        """
         try:
             from websockets.server import serve
         except ImportError:
             logger.error('Run `pip install pygls[ws]` to install `websockets`.')
-            sys.exit(1)
+            raise
 
+        self._use_running_loop()
         logger.info('Starting WebSocket server on {}:{}'.format(host, port))
 
         self._stop_event = Event()
@@ -281,40 +655,57 @@ class Server:
 
         async def connection_made(websocket, _):
             """Handle new connection wrapped in the WebSocket."""
-            self.lsp.transport = WebSocketTransportAdapter(websocket, self.loop)
-            async for message in websocket:
-                self.lsp._procedure_handler(
-                    json.loads(message, object_hook=self.lsp._deserialize_message)
-                )
+            transport = WebSocketTransportAdapter(websocket, self.loop)
+            self.lsp.transport = transport
+            try:
+                async for message in websocket:
+                    self.lsp._message_received(self.lsp._parse_body(message))
+            finally:
+                transport._sender.cancel()
 
-        start_server = serve(connection_made, host, port, loop=self.loop)
-        self._server = start_server.ws_server
-        self.loop.run_until_complete(start_server)
+        self._server = await serve(connection_made, host, port)
+        await self._server.wait_closed()
 
+    def start_ws(self, host: str, port: int) -> None:
+        """Starts WebSocket server."""
         try:
-            self.loop.run_forever()
+            self.loop.run_until_complete(self.serve_ws(host, port))
+        except ImportError:
+            sys.exit(1)
         except (KeyboardInterrupt, SystemExit):
             pass
         finally:
-            self._stop_event.set()
             self.shutdown()
 
     if not IS_PYODIDE:
 
-        @property
-        def thread_pool(self) -> ThreadPool:
-            """Returns thread pool instance (lazy initialization)."""
-            if not self._thread_pool:
-                self._thread_pool = ThreadPool(processes=self._max_workers)
-
-            return self._thread_pool
-
         @property
         def thread_pool_executor(self) -> ThreadPoolExecutor:
-            """Returns thread pool instance (lazy initialization)."""
+            """Returns thread pool instance (lazy initialization).
+
+            All worker threads are started when the pool is created, instead of
+            one by one as the first requests are submitted. The pool is also used
+            as the default executor of the event loop (e.g. by ``asyncio.to_thread``).
+            """
             if not self._thread_pool_executor:
-                self._thread_pool_executor = \
-                    ThreadPoolExecutor(max_workers=self._max_workers)
+                executor = ThreadPoolExecutor(max_workers=self._max_workers)
+
+                # Each task blocks until all workers are running, so that every
+                # submit has to start a new worker
+                barrier = Barrier(self._max_workers)
+                try:
+                    for _ in range(self._max_workers):
+                        executor.submit(barrier.wait)
+                except Exception:
+                    # e.g. a thread couldn't be started, release the workers
+                    # that are already waiting for it
+                    barrier.abort()
+                    executor.shutdown(wait=False)
+                    raise
+
+                self._thread_pool_executor = executor
+                if self._loop is not None:
+                    self._loop.set_default_executor(self._thread_pool_executor)
 
             return self._thread_pool_executor
 
@@ -329,8 +720,9 @@ class LanguageServer(Server):
         name(str): Name of the server
         version(str): Version of the server
         protocol_cls(LanguageServerProtocol): LSP or any subclass of it
-        max_workers(int, optional): Number of workers for `ThreadPool` and
-                                    `ThreadPoolExecutor`
+        max_workers(int, optional): Number of workers for `ThreadPoolExecutor`,
+                                    defaults to ``PYGLS_MAX_WORKERS`` environment
+                                    variable or ``min(32, os.cpu_count() + 4)``
     """
 
     default_error_message = "Unexpected error in LSP server, see server's logs for details"
@@ -346,7 +738,7 @@ class LanguageServer(Server):
         loop=None,
         protocol_cls=LanguageServerProtocol,
         converter_factory=default_converter,
-        max_workers: int = 2
+        max_workers: Optional[int] = None
     ):
 
         if not issubclass(protocol_cls, LanguageServerProtocol):
@@ -16,11 +16,12 @@
 # See the License for the specific language governing permissions and      #
 # limitations under the License.                                           #
 ############################################################################
-import io
 import logging
 import os
 import re
-from typing import List, Optional, Pattern
+from collections import OrderedDict
+from itertools import accumulate, chain
+from typing import List, Optional, Pattern, Tuple
 
 from lsprotocol.types import (
     Position, Range, TextDocumentContentChangeEvent,
@@ -33,6 +34,20 @@ from pygls.uris import to_fs_path, uri_scheme
 # TODO: this is not the best e.g. we capture numbers
 RE_END_WORD = re.compile('^[A-Za-z_0-9]*')
 RE_START_WORD = re.compile('[A-Za-z_0-9]*$')
+# Same as the above, but it can be matched at a given position in a line
+RE_WORD = re.compile('[A-Za-z_0-9]*')
+# Characters matched by the patterns above
+WORD_CHARS = 'ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz_0123456789'
+# Number of characters before a position searched for the start of a word,
+# longer words are searched from the start of the line
+WORD_SEARCH_WINDOW = 64
+
+# Characters ending a line (as split by `str.splitlines`), except for \r which
+# may be followed by \n
+LINE_BREAKS_NOT_CR = frozenset('\n\x0b\x0c\x1c\x1d\x1e\x85\u2028\u2029')
+
+# Number of documents pointing at disk kept by `Workspace.get_document`
+UNMANAGED_DOCUMENTS_CACHE_SIZE = 128
 
 log = logging.getLogger(__name__)
 
@@ -43,7 +58,10 @@ def utf16_unit_offset(chars: str):
     Arguments:
         chars (str): The string to count occurrences of utf-16 code units for.
     """
-    return sum(ord(ch) > 0xFFFF for ch in chars)
+    # Checking for ASCII doesn't need to look at the characters in CPython
+    if chars.isascii():
+        return 0
+    return len(chars.encode('utf-16-le', 'surrogatepass')) // 2 - len(chars)
 
 
 def utf16_num_units(chars: str):
@@ -55,6 +73,27 @@ def utf16_num_units(chars: str):
     return len(chars) + utf16_unit_offset(chars)
 
 
+def _character_from_utf16(line: str, character: int) -> int:
+    """Convert a character offset within `line` from utf-16 code units to utf-32."""
+    if line.isascii():
+        return character
+
+    # The first N code units are part of the first N characters, so there is
+    # no need to encode the rest of the line
+    prefix = line[:character]
+    units = prefix.encode('utf-16-le', 'surrogatepass')
+    if 2 * character >= len(units):
+        # Past the end of the line
+        return character - (len(units) // 2 - len(prefix))
+
+    chars = units[:2 * character].decode('utf-16-le', 'surrogatepass')
+    character = len(chars)
+    # Offset within a surrogate pair refers to the character itself
+    if chars[-1:] != line[character - 1:character]:
+        character -= 1
+    return character
+
+
 def position_from_utf16(lines: List[str], position: Position) -> Position:
     """Convert the position.character from utf-16 code units to utf-32.
 
@@ -81,14 +120,15 @@ def position_from_utf16(lines: List[str], position: Position) -> Position:
         The position with `character` being converted to utf-32 code units.
     """
     try:
-        return Position(
-            line=position.line,
-            character=position.character
-            - utf16_unit_offset(lines[position.line][:position.character])
-        )
+        line = lines[position.line]
     except IndexError:
         return Position(line=len(lines), character=0)
 
+    return Position(
+        line=position.line,
+        character=_character_from_utf16(line, position.character)
+    )
+
 
 def position_to_utf16(lines: List[str], position: Position) -> Position:
     """Convert the position.character from utf-32 to utf-16 code units.
@@ -116,14 +156,15 @@ def position_to_utf16(lines: List[str], position: Position) -> Position:
         The position with `character` being converted to utf-16 code units.
     """
     try:
-        return Position(
-            line=position.line,
-            character=position.character
-            + utf16_unit_offset(lines[position.line][:position.character])
-        )
+        line = lines[position.line]
     except IndexError:
         return Position(line=len(lines), character=0)
 
+    character = position.character
+    if not line.isascii():
+        character += utf16_unit_offset(line[:character])
+    return Position(line=position.line, character=character)
+
 
 def range_from_utf16(lines: List[str], range: Range) -> Range:
     """Convert range.[start|end].character from utf-16 code units to utf-32.
@@ -180,57 +221,89 @@ class Document(object):
 
         self._local = local
         self._source = source
+        # Lines of the source, split on first use. Incremental changes are
+        # applied to the lines and the source is joined again only when needed
+        self._lines: Optional[List[str]] = None
+        # Offset at which each line starts, followed by the length of the source
+        self._line_starts: Optional[List[int]] = None
 
-        self._is_sync_kind_full = sync_kind == TextDocumentSyncKind.Full
-        self._is_sync_kind_incremental = sync_kind == TextDocumentSyncKind.Incremental
-        self._is_sync_kind_none = sync_kind == TextDocumentSyncKind.None_
+        self._sync_kind = sync_kind
 
     def __str__(self):
         return str(self.uri)
 
-    def _apply_incremental_change(self, change: TextDocumentContentChangeEvent_Type1) -> None:
-        """Apply an ``Incremental`` text change to the document"""
-        lines = self.lines
-        text = change.text
-        change_range = change.range
-
-        range = range_from_utf16(lines, change_range)  # type: ignore
-        start_line = range.start.line
-        start_col = range.start.character
-        end_line = range.end.line
-        end_col = range.end.character
-
-        # Check for an edit occurring at the very end of the file
-        if start_line == len(lines):
-            self._source = self.source + text
-            return
-
-        new = io.StringIO()
-
-        # Iterate over the existing document until we hit the edit range,
-        # at which point we write the new text, then loop until we hit
-        # the end of the range and continue writing.
-        for i, line in enumerate(lines):
-            if i < start_line:
-                new.write(line)
-                continue
+    def _set_source(self, source: str) -> None:
+        self._source = source
+        self._lines = None
+        self._line_starts = None
 
-            if i > end_line:
-                new.write(line)
-                continue
+    def _get_line_starts(self) -> List[int]:
+        if self._line_starts is None:
+            self._line_starts = [0]
+            self._line_starts.extend(accumulate(map(len, self.lines)))
+        return self._line_starts
 
-            if i == start_line:
-                new.write(line[:start_col])
-                new.write(text)
+    def _apply_incremental_change(self, change: TextDocumentContentChangeEvent_Type1) -> None:
+        """Apply an ``Incremental`` text change to the document
 
-            if i == end_line:
-                new.write(line[end_col:])
+        Only the edited lines are split again and replaced, the other lines
+        (and the source) are left untouched.
+        """
+        lines = self.lines
+        start = change.range.start
+        end = change.range.end
+
+        # Edits may start or end past the last line (e.g. at the very end of
+        # the file) or past the end of a line
+        if start.line < len(lines):
+            first = start.line
+            line = lines[first]
+            text = line[:_character_from_utf16(line, start.character)] + change.text
+        else:
+            first = len(lines)
+            text = change.text
 
-        self._source = new.getvalue()
+        if end.line < len(lines):
+            last = end.line + 1
+            line = lines[end.line]
+            text += line[_character_from_utf16(line, end.character):]
+        else:
+            last = len(lines)
+
+        # Edited text has to be split together with the lines around it if
+        # they may end up being parts of the same line, i.e. unless there's
+        # a line break between them (\r may still be followed by \n)
+        if first and lines[first - 1][-1:] not in LINE_BREAKS_NOT_CR:
+            first -= 1
+            text = lines[first] + text
+
+        if last < len(lines) and text[-1:] not in LINE_BREAKS_NOT_CR:
+            text += lines[last]
+            last += 1
+
+        # Copying the list and replacing the edited lines in place is faster
+        # than concatenating slices of it
+        edited_lines = text.splitlines(True)
+        new_lines = lines.copy()
+        new_lines[first:last] = edited_lines
+        self._lines = new_lines
+        self._source = None
+
+        # Line offsets before the edit don't change and the ones after it are
+        # shifted by the change in length, so only the edited ones are summed
+        line_starts = self._line_starts
+        if line_starts is not None:
+            edited_starts = list(accumulate(chain((line_starts[first],),
+                                                  map(len, edited_lines))))
+            delta = edited_starts[-1] - line_starts[last]
+            line_starts[first:last + 1] = edited_starts
+            if delta:
+                tail = first + len(edited_starts)
+                line_starts[tail:] = [offset + delta for offset in line_starts[tail:]]
 
     def _apply_full_change(self, change: TextDocumentContentChangeEvent) -> None:
         """Apply a ``Full`` text change to the document."""
-        self._source = change.text
+        self._set_source(change.text)
 
     def _apply_none_change(self, change: TextDocumentContentChangeEvent) -> None:
         """Apply a ``None`` text change to the document
@@ -248,13 +321,15 @@ class Document(object):
         ``Incremental`` versus ``Full`` synchronization:
             Even if a server accepts ``Incremantal`` SyncKinds, clients may request
             a ``Full`` SyncKind. In LSP 3.x, clients make this request by omitting
-            both Range and RangeLength from their request. Consequently, the
-            attributes "range" and "rangeLength" will be missing from ``Full``
-            content update client requests in the pygls Python library.
+            both Range and RangeLength from their request. Consequently, ``Full``
+            content updates are ``TextDocumentContentChangeEvent_Type2`` events
+            in the pygls Python library, events with their "range" set to
+            ``None`` are handled the same way.
 
         """
-        if isinstance(change, TextDocumentContentChangeEvent_Type1):
-            if self._is_sync_kind_incremental:
+        if (isinstance(change, TextDocumentContentChangeEvent_Type1)
+                and change.range is not None):
+            if self._sync_kind == TextDocumentSyncKind.Incremental:
                 self._apply_incremental_change(change)
                 return
             # Log an error, but still perform full update to preserve existing
@@ -266,27 +341,43 @@ class Document(object):
                 "Please update / submit a Pull Request to your LSP client."
             )
 
-        if self._is_sync_kind_none:
+        if self._sync_kind == TextDocumentSyncKind.None_:
             self._apply_none_change(change)
         else:
             self._apply_full_change(change)
 
     @property
     def lines(self) -> List[str]:
-        return self.source.splitlines(True)
+        if self._lines is None:
+            self._lines = self.source.splitlines(True)
+        return self._lines
 
     def offset_at_position(self, position: Position) -> int:
         """Return the character offset pointed at by the given position."""
         lines = self.lines
-        pos = position_from_utf16(lines, position)
-        row, col = pos.line, pos.character
-        return col + sum(len(line) for line in lines[:row])
+        if position.line >= len(lines):
+            return self._get_line_starts()[-1]
+
+        line_start = self._get_line_starts()[position.line]
+        return line_start + _character_from_utf16(lines[position.line], position.character)
 
     @property
     def source(self) -> str:
         if self._source is None:
-            with io.open(self.path, 'r', encoding='utf-8') as f:
-                return f.read()
+            if self._lines is not None:
+                self._source = ''.join(self._lines)
+                return self._source
+
+            # Decoding the whole file at once is faster than reading it
+            # through a text wrapper
+            with open(self.path, 'rb') as f:
+                source = f.read().decode('utf-8')
+
+            # Translate line breaks the same way as reading in text mode
+            if '\r' in source:
+                source = source.replace('\r\n', '\n').replace('\r', '\n')
+
+            self._source = source
         return self._source
 
     def word_at_position(
@@ -314,13 +405,33 @@ class Document(object):
     Returns:
         The word (obtained by concatenating the two matches) at position.
         """
+        # Lines are kept between changes, so this doesn't split the source
         lines = self.lines
         if position.line >= len(lines):
             return ''
 
-        pos = position_from_utf16(lines, position)
-        row, col = pos.line, pos.character
-        line = lines[row]
+        line = lines[position.line]
+        col = _character_from_utf16(line, position.character)
+
+        if re_start_word is RE_START_WORD and re_end_word is RE_END_WORD:
+            # Only look at the characters next to the position, instead of
+            # finding all matches in the whole line
+            col = min(col, len(line))
+            # Like `$`, the start of the word may end before a trailing \n
+            word_end = col - 1 if line[col - 1:col] == '\n' else col
+
+            # Strip the word off the characters before the position, which is
+            # faster than matching them with a regular expression
+            before = line[max(word_end - WORD_SEARCH_WINDOW, 0):word_end]
+            rest = before.rstrip(WORD_CHARS)
+            if not rest and len(before) < word_end:
+                before = line[:word_end]
+                rest = before.rstrip(WORD_CHARS)
+
+            # Always matches, even if only the empty string
+            after = RE_WORD.match(line, col).group()  # type: ignore
+            return before[len(rest):] + after
+
         # Split word in two
         start = line[:col]
         end = line[col:]
@@ -342,6 +453,9 @@ class Workspace(object):
         self._sync_kind = sync_kind
         self._folders = {}
         self._docs = {}
+        # Documents pointing at disk and the stat (mtime, size, inode) of their files
+        self._unmanaged_docs: 'OrderedDict[str, Tuple[Document, Tuple[int, int, int]]]' = \
+            OrderedDict()
 
         if workspace_folders is not None:
             for folder in workspace_folders:
@@ -378,9 +492,36 @@ class Workspace(object):
         Return a managed document if-present,
         else create one pointing at disk.
 
+        Documents pointing at disk are reused for as long as their file
+        isn't modified, so that it's not read again on every request.
+
         See https://github.com/Microsoft/language-server-protocol/issues/177
         """
-        return self._docs.get(doc_uri) or self._create_document(doc_uri)
+        doc = self._docs.get(doc_uri)
+        if doc is not None:
+            return doc
+
+        cached_doc, cached_version = self._unmanaged_docs.pop(doc_uri, (None, None))
+        try:
+            stat = os.stat(to_fs_path(doc_uri))
+        except (OSError, TypeError, ValueError):
+            # Let reading the document report the problem
+            return self._create_document(doc_uri)
+
+        # Modification times may be too coarse to tell apart writes made in
+        # quick succession, so a changed size (or a replaced file) counts too
+        version = (stat.st_mtime_ns, stat.st_size, stat.st_ino)
+        if cached_doc is not None and cached_version == version:
+            doc = cached_doc
+        else:
+            doc = self._create_document(doc_uri)
+
+        # Keep the most recently used documents
+        self._unmanaged_docs[doc_uri] = (doc, version)
+        if len(self._unmanaged_docs) > UNMANAGED_DOCUMENTS_CACHE_SIZE:
+            self._unmanaged_docs.popitem(last=False)
+
+        return doc
 
     def is_local(self):
         return (
@@ -390,6 +531,7 @@ class Workspace(object):
 
     def put_document(self, text_document: TextDocumentItem):
         doc_uri = text_document.uri
+        self._unmanaged_docs.pop(doc_uri, None)
 
         self._docs[doc_uri] = self._create_document(
             doc_uri,
@@ -403,10 +545,6 @@ class Workspace(object):
 
     def remove_folder(self, folder_uri: str):
         self._folders.pop(folder_uri, None)
-        try:
-            del self._folders[folder_uri]
-        except KeyError:
-            pass
 
     @property
     def root_path(self):
@@ -22,6 +22,7 @@ from lsprotocol.types import (
     Position,
     Range,
     TextDocumentContentChangeEvent_Type1,
+    TextDocumentContentChangeEvent_Type2,
     TextDocumentSyncKind,
 )
 from pygls.workspace import (
@@ -93,6 +94,15 @@ def test_document_full_edit():
     assert doc.lines == ["print a, b"]
 
 
+def test_document_full_edit_without_range():
+    doc = Document("file:///uri", "def hello(a, b):\n",
+                   sync_kind=TextDocumentSyncKind.Incremental)
+    change = TextDocumentContentChangeEvent_Type1(range=None, text="print a, b")
+    doc.apply_change(change)
+
+    assert doc.lines == ["print a, b"]
+
+
 def test_document_line_edit():
     doc = Document("file:///uri", "itshelloworld")
     change = TextDocumentContentChangeEvent_Type1(
@@ -107,11 +117,67 @@ def test_document_line_edit():
     assert doc.source == "itsgoodbyeworld"
 
 
+def test_document_line_edit_past_end_of_line():
+    doc = Document("file:///uri", "first\nsecond\nthird\n")
+    change = TextDocumentContentChangeEvent_Type1(
+        range=Range(
+            start=Position(line=0, character=10),
+            end=Position(line=1, character=10)
+        ),
+        text="!",
+    )
+    doc.apply_change(change)
+    assert doc.source == "first\n!third\n"
+
+
+def test_document_line_edit_joins_line_breaks():
+    doc = Document("file:///uri", "first\r\nsecond\r")
+    change = TextDocumentContentChangeEvent_Type1(
+        range=Range(
+            start=Position(line=1, character=0),
+            end=Position(line=1, character=6)
+        ),
+        text="",
+    )
+    doc.apply_change(change)
+    assert doc.lines == ["first\r\n", "\r"]
+
+    change = TextDocumentContentChangeEvent_Type1(
+        range=Range(
+            start=Position(line=2, character=0),
+            end=Position(line=2, character=0)
+        ),
+        text="\nthird",
+    )
+    doc.apply_change(change)
+    assert doc.lines == ["first\r\n", "\r\n", "third"]
+    assert doc.source == "first\r\n\r\nthird"
+
+
 def test_document_lines(doc):
     assert len(doc.lines) == 4
     assert doc.lines[0] == "document\n"
 
 
+def test_document_lines_after_edit():
+    doc = Document("file:///uri", "def hello():\n    pass\n")
+    assert doc.lines == ["def hello():\n", "    pass\n"]
+
+    change = TextDocumentContentChangeEvent_Type1(
+        range=Range(
+            start=Position(line=1, character=4),
+            end=Position(line=1, character=8)
+        ),
+        text="return 1\n    # done",
+    )
+    doc.apply_change(change)
+    assert doc.lines == ["def hello():\n", "    return 1\n", "    # done\n"]
+
+    change = TextDocumentContentChangeEvent_Type2(text="pass")
+    doc.apply_change(change)
+    assert doc.lines == ["pass"]
+
+
 def test_document_multiline_edit():
     old = ["def hello(a, b):\n", "    print a\n", "    print b\n"]
     doc = Document(
@@ -184,6 +250,30 @@ def test_position_from_utf16():
         line=0, character=4
     )
 
+    assert position_from_utf16(
+        ['x😋😋😋'], Position(line=0, character=3)
+    ) == Position(
+        line=0, character=2
+    )
+    # Offset within a surrogate pair
+    assert position_from_utf16(
+        ['x😋😋😋'], Position(line=0, character=4)
+    ) == Position(
+        line=0, character=2
+    )
+
+    # Characters in the Basic Multilingual Plane are single code units
+    assert position_from_utf16(
+        ['x="é"', 'x="a"'], Position(line=0, character=4)
+    ) == Position(
+        line=0, character=4
+    )
+    assert position_from_utf16(
+        ['x="é"', 'x="a"'], Position(line=1, character=4)
+    ) == Position(
+        line=1, character=4
+    )
+
     position = Position(line=0, character=5)
     position_from_utf16(['x="😋"'], position)
     assert position == Position(line=0, character=5)
@@ -257,6 +347,25 @@ def test_offset_at_position(doc):
     assert doc.offset_at_position(Position(line=5, character=0)) == 39
 
 
+def test_offset_at_position_after_edit():
+    doc = Document("file:///uri", "first\nsecond\nthird\n")
+    assert doc.offset_at_position(Position(line=2, character=0)) == 13
+
+    change = TextDocumentContentChangeEvent_Type1(
+        range=Range(
+            start=Position(line=0, character=5),
+            end=Position(line=1, character=0)
+        ),
+        text=" line\nnew\n",
+    )
+    doc.apply_change(change)
+    assert doc.offset_at_position(Position(line=1, character=0)) == 11
+    assert doc.offset_at_position(Position(line=2, character=0)) == 15
+    assert doc.offset_at_position(Position(line=3, character=2)) == 24
+    assert doc.offset_at_position(Position(line=4, character=0)) == 28
+    assert doc.offset_at_position(Position(line=4, character=0)) == len(doc.source)
+
+
 def test_word_at_position(doc):
     """
     Return word under the cursor (or last in line if past the end)
@@ -281,3 +390,10 @@ def test_word_at_position(doc):
         )
         == "unicode."
     )
+
+
+def test_word_at_position_long_line():
+    word = "w" * 100
+    doc = Document(DOC_URI, "x = (" * 1000 + word + ")" * 1000 + "\n")
+    position = Position(line=0, character=5000 + 80)
+    assert doc.word_at_position(position) == word
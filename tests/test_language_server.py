@@ -15,7 +15,9 @@
 # limitations under the License.                                           #
 ############################################################################
 import pathlib
+from threading import Barrier, Event, Thread
 from time import sleep
+from unittest.mock import Mock
 
 import pytest
 
@@ -32,6 +34,7 @@ from lsprotocol.types import (
     InitializeParams,
     TextDocumentItem,
 )
+from pygls import server as server_module
 from pygls.protocol import LanguageServerProtocol
 from pygls.server import LanguageServer
 from . import CMD_ASYNC, CMD_SYNC, CMD_THREAD
@@ -127,6 +130,95 @@ def test_command_thread(client_server):
     assert thread_id != server.thread_id
 
 
+@pytest.mark.skipif(IS_PYODIDE, reason='threads are not available in pyodide.')
+def test_thread_pool_executor_starts_all_workers():
+    server = LanguageServer('pygls-test', 'v1', max_workers=3)
+
+    executor = server.thread_pool_executor
+
+    assert len(executor._threads) == 3
+    executor.shutdown()
+
+
+@pytest.mark.skipif(IS_PYODIDE, reason='threads are not available in pyodide.')
+def test_thread_pool_executor_worker_fails_to_start(monkeypatch):
+    server = LanguageServer('pygls-test', 'v1', max_workers=3)
+    started = []
+    start = Thread.start
+
+    def start_thread(thread):
+        if len(started) == 2:
+            raise RuntimeError("can't start new thread")
+        started.append(thread)
+        start(thread)
+
+    barriers = []
+
+    class RecordingBarrier(Barrier):
+        def __init__(self, parties):
+            super().__init__(parties)
+            barriers.append(self)
+
+    monkeypatch.setattr(Thread, 'start', start_thread)
+    monkeypatch.setattr(server_module, 'Barrier', RecordingBarrier)
+    try:
+        with pytest.raises(RuntimeError):
+            server.thread_pool_executor
+
+        # Workers which were started don't wait for the missing one
+        for thread in started:
+            thread.join(timeout=5)
+            assert not thread.is_alive()
+    finally:
+        for barrier in barriers:
+            barrier.abort()
+
+    assert server._thread_pool_executor is None
+
+
+@pytest.mark.skipif(IS_PYODIDE, reason='threads are not available in pyodide.')
+def test_shutdown_cancels_queued_thread_requests():
+    server = LanguageServer('pygls-test', 'v1', max_workers=1)
+    server.lsp.connection_made(Mock())
+    release = Event()
+
+    @server.thread()
+    def block(params):
+        release.wait()
+
+    for msg_id in range(3):
+        server.lsp._execute_request(msg_id, block, None)
+
+    try:
+        # Requests which haven't started are cancelled and removed while iterating
+        server.lsp.lsp_shutdown()
+    finally:
+        release.set()
+        server.thread_pool_executor.shutdown()
+
+    assert server.lsp._request_futures == {}
+
+
+def test_max_workers_from_environment(monkeypatch):
+    monkeypatch.setenv('PYGLS_MAX_WORKERS', '5')
+
+    assert LanguageServer('pygls-test', 'v1')._max_workers == 5
+    assert LanguageServer('pygls-test', 'v1', max_workers=3)._max_workers == 3
+
+
+@pytest.mark.parametrize('value', ['0', '-1', 'many'])
+def test_invalid_max_workers_from_environment(monkeypatch, value):
+    monkeypatch.setenv('PYGLS_MAX_WORKERS', value)
+
+    assert LanguageServer('pygls-test', 'v1')._max_workers > 0
+
+
+@pytest.mark.parametrize('max_workers', [0, -1])
+def test_invalid_max_workers(max_workers):
+    with pytest.raises(ValueError):
+        LanguageServer('pygls-test', 'v1', max_workers=max_workers)
+
+
 def test_allow_custom_protocol_derived_from_lsp():
     class CustomProtocol(LanguageServerProtocol):
         pass
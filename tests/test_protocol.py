@@ -153,6 +153,29 @@ def test_deserialize_notification_message_unknown_type(protocol):
     assert result.params.field_b.inner_field == "test_inner"
 
 
+def test_deserialize_notification_message_unknown_type_reuses_types(protocol):
+    params = """
+    {
+        "jsonrpc": "2.0",
+        "method": "random",
+        "params": {
+            "items": [
+                {"label": "one", "data": {"inner_field": 1}},
+                {"label": "two", "data": {"inner_field": 2}}
+            ]
+        }
+    }
+    """
+
+    result = json.loads(params, object_hook=protocol._deserialize_message)
+    first, second = result.params.items
+
+    assert (first.label, first.data.inner_field) == ("one", 1)
+    assert (second.label, second.data.inner_field) == ("two", 2)
+    assert type(first) is type(second)
+    assert type(first.data) is type(second.data)
+
+
 def test_deserialize_notification_message_bad_params_should_raise_error(protocol):
     params = f"""
     {{
@@ -450,7 +473,17 @@ def test_deserialize_request_message_without_registered_type(protocol):
                     }
                 },
             }
-        )
+        ),
+        (   # Unknown type with non-str dict keys.
+            JsonRPCResponseMessage,
+            {1: "a"},
+            {"jsonrpc": "2.0", "id": "1", "result": {"1": "a"}},
+        ),
+        (   # Unknown type with an integer that doesn't fit in 64 bits.
+            JsonRPCResponseMessage,
+            2**70,
+            {"jsonrpc": "2.0", "id": "1", "result": 2**70},
+        ),
     ],
 )
 def test_serialize_response_message(msg_type, result, expected):
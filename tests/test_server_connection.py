@@ -1,13 +1,17 @@
 import asyncio
+import io
 import json
 import os
-from threading import Thread
+import socket
+from threading import Event, Thread, get_ident
 from unittest.mock import Mock
 
 import pytest
 
-from pygls import IS_PYODIDE
-from pygls.server import LanguageServer
+from pygls import IS_PYODIDE, IS_WIN
+from pygls.server import (
+    LanguageServer, StdOutTransportAdapter, WebSocketTransportAdapter, aio_readline
+)
 
 try:
     import websockets
@@ -85,6 +89,284 @@ async def test_io_connection_lost():
     server_thread.join()
 
 
+@pytest.mark.skipif(IS_PYODIDE, reason='threads are not available in pyodide.')
+def test_start_io_connects_before_loop_runs():
+    loop = asyncio.new_event_loop()
+    server = LanguageServer('pygls-test', 'v1', loop=loop)
+
+    # Messages can be sent as soon as the server is started
+    transports = []
+    run_until_complete = loop.run_until_complete
+
+    def run(future):
+        transports.append(server.lsp.transport)
+        return run_until_complete(future)
+
+    loop.run_until_complete = run
+    server.start_io(io.BytesIO(), io.BytesIO())
+
+    assert isinstance(transports[0], StdOutTransportAdapter)
+
+
+@pytest.mark.asyncio
+@pytest.mark.skipif(IS_PYODIDE, reason='pipes are not available in pyodide.')
+async def test_serve_io_uses_running_loop():
+    # Client to Server pipe.
+    csr, csw = os.pipe()
+    # Server to client pipe.
+    scr, scw = os.pipe()
+
+    body = b'{"jsonrpc": "2.0", "id": 1, "method": "shutdown", "params": null}'
+    os.write(csw, b'Content-Length: ' + str(len(body)).encode() + b'\r\n\r\n' + body)
+    os.close(csw)
+
+    server = LanguageServer('pygls-test', 'v1')
+    with os.fdopen(csr, "rb") as stdin, os.fdopen(scw, "wb") as stdout:
+        await server.serve_io(stdin, stdout)
+        await asyncio.sleep(0)
+
+    assert server.loop is asyncio.get_running_loop()
+
+    os.set_blocking(scr, False)
+    with os.fdopen(scr, "rb") as client_stdin:
+        assert b'"id":1' in client_stdin.read().replace(b' ', b'')
+
+
+@pytest.mark.asyncio
+@pytest.mark.skipif(IS_PYODIDE, reason='threads are not available in pyodide.')
+async def test_aio_readline():
+    rfd, wfd = os.pipe()
+    body = b'{"jsonrpc": "2.0", "method": "initialized", "params": {}}'
+    message = (
+        b'Content-Length: ' + str(len(body)).encode() + b'\r\n'
+        b'Content-Type: application/vscode-jsonrpc; charset=utf-8\r\n'
+        b'\r\n' + body
+    )
+    os.write(wfd, message * 2)
+    os.close(wfd)
+
+    received = []
+    with os.fdopen(rfd, "rb") as rfile:
+        await aio_readline(asyncio.get_running_loop(), Event(), rfile, received.append)
+
+    assert received == [message, message]
+
+
+@pytest.mark.asyncio
+@pytest.mark.skipif(IS_PYODIDE or IS_WIN, reason='socketpair is used as stdin and stdout.')
+async def test_aio_readline_socket_stays_blocking():
+    server_sock, client_sock = socket.socketpair()
+    body = b'{"jsonrpc": "2.0", "method": "initialized", "params": {}}'
+    message = b'Content-Length: ' + str(len(body)).encode() + b'\r\n\r\n' + body
+    client_sock.sendall(message)
+    client_sock.shutdown(socket.SHUT_WR)
+
+    received = []
+    with server_sock, client_sock, server_sock.makefile("rb") as rfile:
+        await aio_readline(asyncio.get_running_loop(), Event(), rfile, received.append)
+
+        # The same socket may be used for writing responses
+        assert os.get_blocking(server_sock.fileno())
+
+    assert received == [message]
+
+
+@pytest.mark.asyncio
+@pytest.mark.skipif(IS_PYODIDE, reason='threads are not available in pyodide.')
+async def test_aio_readline_invalid_content_length(tmp_path):
+    body = b'{"jsonrpc": "2.0", "method": "initialized", "params": {}}'
+    message = b'Content-Length: ' + str(len(body)).encode() + b'\r\n\r\n' + body
+    data = b'Content-Length: abc\r\n\r\n{}' + message
+    path = tmp_path / "input"
+    path.write_bytes(data)
+
+    # Read by the event loop
+    rfd, wfd = os.pipe()
+    os.write(wfd, data)
+    os.close(wfd)
+    received = []
+    with os.fdopen(rfd, "rb") as rfile:
+        await aio_readline(
+            asyncio.get_running_loop(), Event(), rfile, received.append, json.loads
+        )
+    assert received == [json.loads(body)]
+
+    # Read in a separate thread
+    received = []
+    with open(path, "rb") as rfile:
+        await aio_readline(
+            asyncio.get_running_loop(), Event(), rfile, received.append, json.loads
+        )
+    assert received == [json.loads(body)]
+
+
+@pytest.mark.asyncio
+@pytest.mark.skipif(IS_PYODIDE, reason='threads are not available in pyodide.')
+async def test_aio_readline_file(tmp_path):
+    body = b'{"jsonrpc": "2.0", "method": "test", "params": "' + b'x' * 200000 + b'"}'
+    message = b'Content-Length: ' + str(len(body)).encode() + b'\r\n\r\n' + body
+    path = tmp_path / "input"
+    path.write_bytes(message * 2)
+
+    received = []
+    with open(path, "rb") as rfile:
+        await aio_readline(asyncio.get_running_loop(), Event(), rfile, received.append)
+
+    assert received == [message, message]
+
+
+@pytest.mark.asyncio
+@pytest.mark.skipif(IS_PYODIDE, reason='threads are not available in pyodide.')
+async def test_aio_readline_file_already_read(tmp_path):
+    body = b'{"jsonrpc": "2.0", "method": "initialized", "params": {}}'
+    message = b'Content-Length: ' + str(len(body)).encode() + b'\r\n\r\n' + body
+    path = tmp_path / "input"
+    path.write_bytes(b'HELLO\n' + message * 3)
+
+    received = []
+    with open(path, "rb") as rfile:
+        # Reads the whole (small) file into the buffer of ``rfile``
+        assert rfile.readline() == b'HELLO\n'
+        await aio_readline(asyncio.get_running_loop(), Event(), rfile, received.append)
+
+    assert received == [message] * 3
+
+
+@pytest.mark.asyncio
+@pytest.mark.skipif(IS_PYODIDE, reason='threads are not available in pyodide.')
+async def test_aio_readline_without_fileno():
+    body = b'{"jsonrpc": "2.0", "method": "test", "params": "' + b'x' * 100000 + b'"}'
+    message = b'Content-Length: ' + str(len(body)).encode() + b'\r\n\r\n' + body
+
+    class Input:
+        """Readable stream that only implements ``read``."""
+
+        def __init__(self, data):
+            self._data = io.BytesIO(data)
+
+        def read(self, size=-1):
+            return self._data.read(size)
+
+    for rfile in (io.BytesIO(message * 2), Input(message * 2)):
+        received = []
+        await aio_readline(asyncio.get_running_loop(), Event(), rfile, received.append)
+        assert received == [message, message]
+
+
+@pytest.mark.asyncio
+@pytest.mark.skipif(IS_PYODIDE, reason='threads are not available in pyodide.')
+async def test_aio_readline_parse_in_reader_thread(tmp_path):
+    body = b'{"jsonrpc": "2.0", "method": "initialized", "params": {}}'
+    large_body = b'{"jsonrpc": "2.0", "method": "test", "params": "' + b'x' * 200000 + b'"}'
+    path = tmp_path / "input"
+    path.write_bytes(b''.join(
+        b'Content-Length: ' + str(len(data)).encode() + b'\r\n\r\n' + data
+        for data in (body, large_body, body)
+    ))
+
+    parse_threads = []
+    received = []
+
+    def parse(data):
+        parse_threads.append(get_ident())
+        return json.loads(data)
+
+    def proxy(message):
+        assert get_ident() == loop_thread
+        received.append(message)
+
+    loop_thread = get_ident()
+    with open(path, "rb") as rfile:
+        await aio_readline(asyncio.get_running_loop(), Event(), rfile, proxy, parse)
+
+    assert received == [json.loads(body), json.loads(large_body), json.loads(body)]
+    assert loop_thread not in parse_threads
+
+
+@pytest.mark.asyncio
+@pytest.mark.skipif(IS_PYODIDE, reason='threads are not available in pyodide.')
+async def test_stdout_transport_coalesces_writes():
+    class Output:
+        def __init__(self):
+            self.writes = []
+
+        def write(self, data):
+            self.writes.append(bytes(data))
+
+        def flush(self):
+            pass
+
+    wfile = Output()
+    transport = StdOutTransportAdapter(Mock(), wfile, asyncio.get_running_loop())
+
+    transport.write(b'one')
+    transport.write(b'two')
+    assert wfile.writes == []
+
+    await asyncio.sleep(0)
+    assert wfile.writes == [b'onetwo']
+
+    # Writes from other threads are sent right away, after buffered data
+    transport.write(b'three')
+    thread = Thread(target=transport.write, args=(b'four',))
+    thread.start()
+    thread.join()
+    assert wfile.writes == [b'onetwo', b'threefour']
+
+
+@pytest.mark.asyncio
+@pytest.mark.skipif(IS_PYODIDE, reason='threads are not available in pyodide.')
+async def test_stdout_transport_flush_error():
+    class Output:
+        def __init__(self):
+            self.writes = []
+            self.error = BrokenPipeError()
+
+        def write(self, data):
+            if self.error:
+                raise self.error
+            self.writes.append(bytes(data))
+
+        def flush(self):
+            pass
+
+    wfile = Output()
+    on_error = Mock()
+    transport = StdOutTransportAdapter(Mock(), wfile, asyncio.get_running_loop(), on_error)
+
+    transport.write(b'one')
+    await asyncio.sleep(0)
+    on_error.assert_called_once_with(wfile.error)
+
+    # Data that failed to be written doesn't block later writes
+    wfile.error = None
+    transport.write(b'two')
+    await asyncio.sleep(0)
+    assert wfile.writes == [b'two']
+
+
+@pytest.mark.asyncio
+@pytest.mark.skipif(IS_PYODIDE, reason='threads are not available in pyodide.')
+async def test_aio_readline_large_message():
+    rfd, wfd = os.pipe()
+    body = b'{"jsonrpc": "2.0", "method": "test", "params": "' + b'x' * 200000 + b'"}'
+    message = b'Content-Length: ' + str(len(body)).encode() + b'\r\n\r\n' + body
+
+    def write():
+        with os.fdopen(wfd, "wb") as wfile:
+            wfile.write(message * 3)
+
+    writer_thread = Thread(target=write, daemon=True)
+    writer_thread.start()
+
+    received = []
+    with os.fdopen(rfd, "rb") as rfile:
+        await aio_readline(asyncio.get_running_loop(), Event(), rfile, received.append)
+
+    writer_thread.join()
+    assert received == [message] * 3
+
+
 @pytest.mark.asyncio
 @pytest.mark.skipif(
     IS_PYODIDE or not WEBSOCKETS_AVAILABLE,
@@ -138,3 +420,56 @@ async def test_ws_server():
         await connection.send(json.dumps(msg))
 
     server_thread.join()
+
+
+def test_pyodide_transport_recv(capsys):
+    server = LanguageServer('pygls-test', 'v1')
+    transport = server.start_pyodide()
+
+    try:
+        # Messages may arrive as JSON...
+        transport.recv(
+            '{"jsonrpc": "2.0", "id": 1, "method": "unknown", "params": null}'
+        )
+        # ...or already decoded by the web platform
+        transport.recv(dict(jsonrpc="2.0", id=2, method="shutdown", params=None))
+    finally:
+        server.loop.close()
+
+    output = capsys.readouterr().out
+    assert '"id":1' in output.replace(' ', '')
+    assert '"id":2' in output.replace(' ', '')
+
+
+@pytest.mark.asyncio
+@pytest.mark.skipif(IS_PYODIDE, reason='threads are not available in pyodide.')
+async def test_ws_transport_write():
+    class WebSocket:
+        def __init__(self):
+            self.sent = []
+
+        async def send(self, data):
+            self.sent.append(data)
+
+    ws = WebSocket()
+    transport = WebSocketTransportAdapter(ws, asyncio.get_running_loop())
+
+    try:
+        # Queued right away when written from the event loop...
+        transport.write('one')
+        assert transport._queue.qsize() == 1
+
+        # ...and handed over to the event loop from other threads
+        thread = Thread(target=transport.write, args=('two',))
+        thread.start()
+        thread.join()
+
+        async def wait_sent():
+            while len(ws.sent) < 2:
+                await asyncio.sleep(0.01)
+
+        await asyncio.wait_for(wait_sent(), timeout=5)
+    finally:
+        transport._sender.cancel()
+
+    assert ws.sent == ['one', 'two']
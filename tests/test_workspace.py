@@ -52,6 +52,43 @@ def test_get_missing_document(tmpdir, workspace):
     assert workspace.get_document(doc_uri).source == DOC_TEXT
 
 
+def test_get_missing_document_reuses_it(tmpdir, workspace):
+    doc_path = tmpdir.join("test_document.py")
+    doc_path.write(DOC_TEXT)
+    doc_uri = uris.from_fs_path(str(doc_path))
+
+    doc = workspace.get_document(doc_uri)
+    assert doc.source == DOC_TEXT
+    assert workspace.get_document(doc_uri) is doc
+
+    # Modified file is read again
+    doc_path.write("modified")
+    stat = os.stat(str(doc_path))
+    os.utime(str(doc_path), ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    assert workspace.get_document(doc_uri).source == "modified"
+
+
+def test_get_missing_document_modified_within_mtime_tick(tmpdir, workspace):
+    doc_path = tmpdir.join("test_document.py")
+    doc_path.write(DOC_TEXT)
+    doc_uri = uris.from_fs_path(str(doc_path))
+    stat = os.stat(str(doc_path))
+
+    assert workspace.get_document(doc_uri).source == DOC_TEXT
+
+    # File is modified without a change of its modification time
+    doc_path.write("modified")
+    os.utime(str(doc_path), ns=(stat.st_atime_ns, stat.st_mtime_ns))
+    assert workspace.get_document(doc_uri).source == "modified"
+
+
+def test_get_missing_document_line_breaks(tmpdir, workspace):
+    doc_path = tmpdir.join("test_document.py")
+    doc_path.write_binary("first\r\nsecond\rthird\n".encode("utf-8"))
+    doc_uri = uris.from_fs_path(str(doc_path))
+    assert workspace.get_document(doc_uri).source == "first\nsecond\nthird\n"
+
+
 def test_put_document(workspace):
     workspace.put_document(DOC)
     assert DOC_URI in workspace._docs